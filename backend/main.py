@@ -52,6 +52,12 @@ system_config = SystemConfigService()
 pipeline_manager = PipelineManager()
 websocket_manager = WebSocketManager()
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush debounced configuration writes and release OCR engines before exiting"""
+    await system_config.flush()
+    document_discovery.close()
+
 # Pydantic models for request/response
 class DocumentDiscoveryRequest(BaseModel):
     topic: str
@@ -285,10 +291,7 @@ async def handle_pipeline_stage1(client_id: str, data: Dict[str, Any]):
             topic=data.get("topic", ""),
             config=data.get("config", {})
         ):
-            await websocket_manager.send_message(client_id, {
-                "type": "pipeline_stage1_update",
-                **update
-            })
+            await websocket_manager.send_event(client_id, "pipeline_stage1_update", update)
             
     except Exception as e:
         await websocket_manager.send_error(client_id, f"Pipeline Stage 1 error: {str(e)}")
@@ -301,10 +304,7 @@ async def handle_pipeline_stage2(client_id: str, data: Dict[str, Any]):
             output_phase=data.get("output_phase", 1),
             config=data.get("config", {})
         ):
-            await websocket_manager.send_message(client_id, {
-                "type": "pipeline_stage2_update",
-                **update
-            })
+            await websocket_manager.send_event(client_id, "pipeline_stage2_update", update)
             
     except Exception as e:
         await websocket_manager.send_error(client_id, f"Pipeline Stage 2 error: {str(e)}")
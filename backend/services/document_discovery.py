@@ -3,9 +3,11 @@ Document Discovery Service - Migrated from frontend web-search.ts
 """
 
 import asyncio
+import threading
+from contextlib import aclosing
 import logging
 import re
-from typing import Dict, List, Any, AsyncGenerator, Union
+from typing import Dict, List, Any, AsyncGenerator, AsyncIterator, Iterator, Union, Optional, Tuple
 from datetime import datetime
 import httpx
 from bs4 import BeautifulSoup
@@ -13,17 +15,71 @@ import json
 import hashlib
 import os
 import base64
+import shutil
+import io
+import struct
 from pathlib import Path
+from types import MappingProxyType
 import mimetypes
 from PIL import Image
 import PyPDF2
 import openpyxl
 import csv
 import chardet
+import queue
+
+try:
+    # Optional: direct Tesseract bindings for OCR (no per-image process spawn)
+    from tesserocr import PyTessBaseAPI
+except ImportError:
+    PyTessBaseAPI = None
 
 logger = logging.getLogger(__name__)
 
+# Supported file types for local upload (shared, read-only)
+_SUPPORTED_FILE_TYPES = MappingProxyType({
+    '.pdf': 'application/pdf',
+    '.csv': 'text/csv',
+    '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    '.xls': 'application/vnd.ms-excel',
+    '.doc': 'application/msword',
+    '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    '.txt': 'text/plain',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif'
+})
+
+# Tesseract engines kept when OCR_POOL_SIZE is unset or invalid
+_DEFAULT_OCR_POOL_SIZE = 2
+
+# Put in a closed OCR pool so waiting borrowers wake up and fail fast
+_POOL_CLOSED = object()
+
+# Base64 characters read per write; decoding is re-aligned to 4-character quanta
+_BASE64_CHUNK_SIZE = 1 << 16
+# Anything outside the base64 alphabet (line breaks, spaces) is skipped, as b64decode does
+_BASE64_IGNORED = re.compile(r"[^A-Za-z0-9+/=]+")
+
+# Display document type per file extension
+_DOC_TYPE_MAP = MappingProxyType({
+    '.pdf': 'PDF',
+    '.csv': 'CSV',
+    '.xlsx': 'Excel',
+    '.xls': 'Excel',
+    '.doc': 'Word',
+    '.docx': 'Word',
+    '.txt': 'Text',
+    '.jpg': 'Image',
+    '.jpeg': 'Image',
+    '.png': 'Image',
+    '.gif': 'Image'
+})
+
 class DocumentDiscoveryService:
+    supported_file_types = _SUPPORTED_FILE_TYPES
+    
     def __init__(self):
         self.discovered_documents = []
         self.document_hashes = set()
@@ -42,20 +98,60 @@ class DocumentDiscoveryService:
         os.makedirs("./data/documents", exist_ok=True)
         os.makedirs("./data/uploads", exist_ok=True)
         
-        # Supported file types for local upload
-        self.supported_file_types = {
-            '.pdf': 'application/pdf',
-            '.csv': 'text/csv',
-            '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            '.xls': 'application/vnd.ms-excel',
-            '.doc': 'application/msword',
-            '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-            '.txt': 'text/plain',
-            '.jpg': 'image/jpeg',
-            '.jpeg': 'image/jpeg',
-            '.png': 'image/png',
-            '.gif': 'image/gif'
-        }
+        # OCR for images is opt-in (ENABLE_OCR=true) and needs tesserocr installed.
+        # Tesseract APIs are created on first use, up to OCR_POOL_SIZE, and reused
+        # across images; close() releases them.
+        self._tess_pool = None
+        self._tess_pool_size = _DEFAULT_OCR_POOL_SIZE
+        self._tess_created = 0
+        self._tess_lock = threading.Lock()
+        if os.getenv("ENABLE_OCR", "false").lower() == "true":
+            if PyTessBaseAPI is None:
+                logger.warning("ENABLE_OCR is set but tesserocr is not installed; OCR disabled")
+            else:
+                self._tess_pool = queue.Queue()
+                pool_size = os.getenv("OCR_POOL_SIZE", str(_DEFAULT_OCR_POOL_SIZE))
+                try:
+                    self._tess_pool_size = max(1, int(pool_size))
+                except ValueError:
+                    logger.warning(f"Invalid OCR_POOL_SIZE {pool_size!r}; using {_DEFAULT_OCR_POOL_SIZE}")
+    
+    def close(self):
+        """Release the pooled Tesseract APIs (idle ones; call on shutdown)"""
+        pool, self._tess_pool = self._tess_pool, None
+        if pool is None:
+            return
+        while True:
+            try:
+                api = pool.get_nowait()
+            except queue.Empty:
+                break
+            if api is not _POOL_CLOSED:
+                api.End()
+        # Wake any worker waiting for an engine; each passes the marker on
+        pool.put(_POOL_CLOSED)
+    
+    def _borrow_tess_api(self, pool: queue.Queue):
+        """Take an idle Tesseract API, creating one while the pool is below its cap"""
+        try:
+            api = pool.get_nowait()
+        except queue.Empty:
+            with self._tess_lock:
+                create = self._tess_created < self._tess_pool_size
+                if create:
+                    self._tess_created += 1
+            if create:
+                try:
+                    return PyTessBaseAPI()
+                except Exception:
+                    with self._tess_lock:
+                        self._tess_created -= 1
+                    raise
+            api = pool.get()
+        if api is _POOL_CLOSED:
+            pool.put(_POOL_CLOSED)
+            raise RuntimeError("OCR pool is closed")
+        return api
     
     async def discover_documents(self, topic: str, certification_level: str = "all", 
                                max_documents: int = 4, sources: List[str] = None,
@@ -699,8 +795,9 @@ class DocumentDiscoveryService:
             "count": len(processed_files)
         }
     
-    async def _process_single_file(self, file_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Process a single uploaded file"""
+    async def _process_single_file(self, file_data: Dict[str, Any],
+                                   source_path: Optional[Path] = None) -> Dict[str, Any]:
+        """Process a single uploaded file (or copy one from disk when source_path is set)"""
         
         file_name = file_data.get('name', 'unknown')
         file_content = file_data.get('content')  # Base64 encoded content
@@ -722,11 +819,12 @@ class DocumentDiscoveryService:
         local_path = f"./data/uploads/{file_id}_{file_name}"
         
         try:
-            if file_content:
+            if source_path:
+                # Copy straight from disk (sendfile/copy_file_range where available)
+                await asyncio.to_thread(shutil.copyfile, source_path, local_path)
+            elif file_content:
                 # Decode base64 content and save
-                file_bytes = base64.b64decode(file_content)
-                with open(local_path, 'wb') as f:
-                    f.write(file_bytes)
+                await asyncio.to_thread(self._write_base64_file, local_path, file_content)
             
             # Extract text content based on file type
             extracted_text = await self._extract_text_from_file(local_path, file_extension)
@@ -760,6 +858,26 @@ class DocumentDiscoveryService:
                 os.remove(local_path)
             return None
     
+    def _write_base64_file(self, local_path: str, file_content: str) -> None:
+        """Decode base64 content to disk in fixed-size chunks
+        
+        Each chunk is stripped of non-alphabet characters and only whole
+        4-character quanta are decoded; the remainder carries into the next
+        chunk, so wrapped input (e.g. base64.encodebytes) decodes correctly.
+        """
+        with open(local_path, 'wb') as f:
+            pending = ""
+            for start in range(0, len(file_content), _BASE64_CHUNK_SIZE):
+                pending += _BASE64_IGNORED.sub("", file_content[start:start + _BASE64_CHUNK_SIZE])
+                aligned = len(pending) - len(pending) % 4
+                if "=" in pending[:aligned]:
+                    # Padding ends the data; b64decode ignores whatever follows it
+                    break
+                f.write(base64.b64decode(pending[:aligned]))
+                pending = pending[aligned:]
+            if pending:
+                f.write(base64.b64decode(pending))
+    
     async def _process_directory(self, directory_path: str) -> List[Dict[str, Any]]:
         """Process all supported files in a directory"""
         
@@ -773,18 +891,13 @@ class DocumentDiscoveryService:
         for file_path in directory.rglob('*'):
             if file_path.is_file() and file_path.suffix.lower() in self.supported_file_types:
                 try:
-                    # Read file content
-                    with open(file_path, 'rb') as f:
-                        file_content = base64.b64encode(f.read()).decode('utf-8')
-                    
                     file_data = {
                         'name': file_path.name,
-                        'content': file_content,
                         'type': self.supported_file_types.get(file_path.suffix.lower(), ''),
                         'size': file_path.stat().st_size
                     }
                     
-                    processed_file = await self._process_single_file(file_data)
+                    processed_file = await self._process_single_file(file_data, source_path=file_path)
                     if processed_file:
                         processed_files.append(processed_file)
                         
@@ -794,18 +907,23 @@ class DocumentDiscoveryService:
         
         return processed_files
     
-    async def _extract_text_from_file(self, file_path: str, file_extension: str) -> str:
-        """Extract text content from various file types"""
+    async def _extract_text_from_file(self, file_path: str, file_extension: str,
+                                      max_chars: Optional[int] = None) -> str:
+        """Extract text content from various file types
+        
+        max_chars lets prefix-only callers (e.g. summaries) stop PDF and text
+        extraction early; None extracts everything for indexing.
+        """
         
         try:
             if file_extension == '.pdf':
-                return await self._extract_text_from_pdf(file_path)
+                return await self._extract_text_from_pdf(file_path, max_chars)
             elif file_extension == '.csv':
                 return await self._extract_text_from_csv(file_path)
             elif file_extension in ['.xlsx', '.xls']:
                 return await self._extract_text_from_excel(file_path)
             elif file_extension == '.txt':
-                return await self._extract_text_from_txt(file_path)
+                return await self._extract_text_from_txt(file_path, max_chars)
             elif file_extension in ['.jpg', '.jpeg', '.png', '.gif']:
                 return await self._extract_text_from_image(file_path)
             elif file_extension in ['.doc', '.docx']:
@@ -817,24 +935,72 @@ class DocumentDiscoveryService:
             logger.error(f"Error extracting text from {file_path}: {str(e)}")
             return f"Error extracting text: {str(e)}"
     
-    async def _extract_text_from_pdf(self, file_path: str) -> str:
+    async def _extract_text_from_pdf(self, file_path: str, max_chars: Optional[int] = None) -> str:
         """Extract text from PDF file"""
-        text_content = []
+        text_content = io.StringIO()
         
         try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text_content.append(page.extract_text())
+            async with aclosing(self._iter_pdf_pages(file_path)) as pages:
+                async for page_index, page_text in pages:
+                    if page_index:
+                        text_content.write('\n')
+                    text_content.write(page_text)
+                    
+                    # Stop reading pages once the caller has enough text
+                    if max_chars is not None and text_content.tell() >= max_chars:
+                        return text_content.getvalue()[:max_chars]
             
-            return '\n'.join(text_content)
+            return text_content.getvalue()
             
         except Exception as e:
             logger.error(f"Error reading PDF {file_path}: {str(e)}")
             return f"PDF processing error: {str(e)}"
     
+    async def _iter_pdf_pages(self, file_path: str) -> AsyncIterator[Tuple[int, str]]:
+        """Yield (page index, page text) one page at a time"""
+        # Each page is parsed in a worker thread so the event loop stays free
+        pages = self._iter_pdf_pages_sync(file_path)
+        # Held while a worker runs next(), so the reader is never closed mid-page
+        reading = threading.Lock()
+        
+        def next_page():
+            with reading:
+                return next(pages, None)
+        
+        def close_pages():
+            with reading:
+                pages.close()
+        
+        try:
+            while True:
+                page = await asyncio.to_thread(next_page)
+                if page is None:
+                    break
+                yield page
+        finally:
+            if reading.acquire(blocking=False):
+                try:
+                    pages.close()
+                finally:
+                    reading.release()
+            else:
+                # Cancelled while a page is still being parsed: close once it returns,
+                # without blocking the loop or masking the cancellation
+                asyncio.get_running_loop().run_in_executor(None, close_pages)
+    
+    def _iter_pdf_pages_sync(self, file_path: str) -> Iterator[Tuple[int, str]]:
+        """Blocking PyPDF2 page reader backing _iter_pdf_pages"""
+        with open(file_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            for page_index, page in enumerate(pdf_reader.pages):
+                yield page_index, page.extract_text()
+    
     async def _extract_text_from_csv(self, file_path: str) -> str:
         """Extract text from CSV file"""
+        return await asyncio.to_thread(self._extract_text_from_csv_sync, file_path)
+    
+    def _extract_text_from_csv_sync(self, file_path: str) -> str:
+        """Blocking CSV extraction, run off the event loop"""
         text_content = []
         
         try:
@@ -864,6 +1030,10 @@ class DocumentDiscoveryService:
     
     async def _extract_text_from_excel(self, file_path: str) -> str:
         """Extract text from Excel file"""
+        return await asyncio.to_thread(self._extract_text_from_excel_sync, file_path)
+    
+    def _extract_text_from_excel_sync(self, file_path: str) -> str:
+        """Blocking Excel extraction, run off the event loop"""
         text_content = []
         
         try:
@@ -895,16 +1065,20 @@ class DocumentDiscoveryService:
             logger.error(f"Error reading Excel {file_path}: {str(e)}")
             return f"Excel processing error: {str(e)}"
     
-    async def _extract_text_from_txt(self, file_path: str) -> str:
+    async def _extract_text_from_txt(self, file_path: str, max_chars: Optional[int] = None) -> str:
         """Extract text from text file"""
+        return await asyncio.to_thread(self._extract_text_from_txt_sync, file_path, max_chars)
+    
+    def _extract_text_from_txt_sync(self, file_path: str, max_chars: Optional[int] = None) -> str:
+        """Blocking text-file extraction, run off the event loop"""
         try:
-            # Detect encoding
+            # Detect encoding (a capped read only needs to sample its own prefix)
             with open(file_path, 'rb') as file:
-                raw_data = file.read()
+                raw_data = file.read(max_chars * 4 if max_chars is not None else -1)
                 encoding = chardet.detect(raw_data)['encoding'] or 'utf-8'
             
             with open(file_path, 'r', encoding=encoding) as file:
-                return file.read()
+                return file.read(max_chars)
                 
         except Exception as e:
             logger.error(f"Error reading text file {file_path}: {str(e)}")
@@ -912,16 +1086,81 @@ class DocumentDiscoveryService:
     
     async def _extract_text_from_image(self, file_path: str) -> str:
         """Extract text from image file (basic metadata)"""
+        return await asyncio.to_thread(self._extract_text_from_image_sync, file_path)
+    
+    def _extract_text_from_image_sync(self, file_path: str) -> str:
+        """Blocking image metadata extraction, run off the event loop"""
         try:
-            with Image.open(file_path) as img:
-                # For now, just return image metadata
-                # In production, you might want to use OCR (like Tesseract)
-                return f"Image file: {img.format}, Size: {img.size}, Mode: {img.mode}"
+            # Parse dimensions straight from the file header when we can,
+            # so metadata extraction never reads the image body
+            header = self._read_image_header(file_path)
+            if header:
+                img_format, img_size, img_mode = header
+                metadata = f"Image file: {img_format}, Size: {img_size}, Mode: {img_mode}"
+            else:
+                with Image.open(file_path) as img:
+                    metadata = f"Image file: {img.format}, Size: {img.size}, Mode: {img.mode}"
+            
+            pool = self._tess_pool
+            if pool is None:
+                return metadata
+            
+            # Borrow an initialised Tesseract API from the pool for OCR
+            api = self._borrow_tess_api(pool)
+            try:
+                api.SetImageFile(file_path)
+                ocr_text = api.GetUTF8Text()
+            finally:
+                if self._tess_pool is pool:
+                    pool.put(api)
+                else:
+                    # The pool was closed while this image was being read
+                    api.End()
+            
+            return f"{metadata}\n{ocr_text.strip()}" if ocr_text.strip() else metadata
                 
         except Exception as e:
             logger.error(f"Error reading image {file_path}: {str(e)}")
             return f"Image processing error: {str(e)}"
     
+    def _read_image_header(self, file_path: str) -> Optional[Tuple[str, Tuple[int, int], str]]:
+        """Read format, size and mode from PNG/JPEG headers without decoding"""
+        with open(file_path, 'rb') as file:
+            head = file.read(26)
+            
+            # PNG: signature followed by the IHDR chunk
+            if head[:8] == b'\x89PNG\r\n\x1a\n' and head[12:16] == b'IHDR':
+                width, height = struct.unpack('>II', head[16:24])
+                bit_depth, color_type = head[24], head[25]
+                png_modes = {0: 'L', 2: 'RGB', 3: 'P', 4: 'LA', 6: 'RGBA'}
+                if bit_depth != 8 or color_type not in png_modes:
+                    return None
+                return 'PNG', (width, height), png_modes[color_type]
+            
+            # JPEG: walk segment markers until the first SOF frame header
+            if head[:2] == b'\xff\xd8':
+                file.seek(2)
+                data = file.read(65536)
+                pos = 0
+                while pos + 4 <= len(data):
+                    if data[pos] != 0xFF:
+                        return None
+                    marker = data[pos + 1]
+                    if marker == 0xFF:
+                        pos += 1
+                        continue
+                    segment_length = struct.unpack('>H', data[pos + 2:pos + 4])[0]
+                    if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                        if pos + 10 > len(data):
+                            return None
+                        height, width = struct.unpack('>HH', data[pos + 5:pos + 9])
+                        jpeg_modes = {1: 'L', 3: 'RGB', 4: 'CMYK'}
+                        mode = jpeg_modes.get(data[pos + 9])
+                        return ('JPEG', (width, height), mode) if mode else None
+                    pos += 2 + segment_length
+        
+        return None
+    
     async def _extract_text_from_word(self, file_path: str) -> str:
         """Extract text from Word document"""
         # Note: This would require python-docx for .docx files
@@ -930,20 +1169,7 @@ class DocumentDiscoveryService:
     
     def _get_document_type(self, file_extension: str) -> str:
         """Get document type based on file extension"""
-        type_mapping = {
-            '.pdf': 'PDF',
-            '.csv': 'CSV',
-            '.xlsx': 'Excel',
-            '.xls': 'Excel',
-            '.doc': 'Word',
-            '.docx': 'Word',
-            '.txt': 'Text',
-            '.jpg': 'Image',
-            '.jpeg': 'Image',
-            '.png': 'Image',
-            '.gif': 'Image'
-        }
-        return type_mapping.get(file_extension, 'Document')
+        return _DOC_TYPE_MAP.get(file_extension, 'Document')
     
     def _format_file_size(self, size_bytes: int) -> str:
         """Format file size in human readable format"""
@@ -4,12 +4,76 @@ Document Search Service - Migrated from frontend DocumentSearch.tsx
 
 import asyncio
 import logging
-from typing import Dict, List, Any, Optional
-from datetime import datetime
+from collections import Counter, OrderedDict
+from typing import Dict, List, Any, AsyncGenerator, NamedTuple, Optional, Tuple
+from services.timestamps import now_iso
 import json
+import os
+import re
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+_SEARCH_SUGGESTIONS = (
+    "BGP configuration",
+    "OSPF troubleshooting",
+    "MPLS VPN setup",
+    "ASA firewall rules",
+    "QoS implementation",
+    "EIGRP optimization",
+    "VLAN configuration",
+    "Spanning tree protocol",
+    "Cisco IOS XE configuration",
+    "Network security best practices",
+    "Wireless controller setup",
+    "Voice over IP configuration",
+    "Data center switching",
+    "Service provider routing"
+)
+# Lowercased once, so matching a keystroke is a plain substring scan
+_SEARCH_SUGGESTIONS_LOWER = tuple(suggestion.lower() for suggestion in _SEARCH_SUGGESTIONS)
+
+_CATEGORY_KEYWORDS = {
+    "Routing": ("bgp", "ospf", "eigrp", "rip", "routing", "route"),
+    "Switching": ("vlan", "stp", "spanning", "switch", "switching"),
+    "Security": ("asa", "firewall", "acl", "security", "vpn"),
+    "Wireless": ("wireless", "wifi", "wlan", "access point", "controller"),
+    "Voice": ("voice", "voip", "cucm", "unity", "telephony"),
+    "Data Center": ("nexus", "data center", "datacenter", "fabric"),
+    "Service Provider": ("mpls", "service provider", "carrier", "isp")
+}
+
+# One alternation per category: a single regex scan replaces a find() per keyword
+_CATEGORY_PATTERNS = tuple(
+    (category, re.compile("|".join(re.escape(keyword) for keyword in keywords)))
+    for category, keywords in _CATEGORY_KEYWORDS.items()
+)
+
+_MAX_SUGGESTIONS = 5
+_MAX_SUGGESTION_SESSIONS = 1024
+_MAX_CACHED_QUERY_WORDS = 4096
+
+class _SearchColumns(NamedTuple):
+    """Column arrays aligned with search_results positions"""
+    scores: np.ndarray
+    doctypes: np.ndarray
+    software: np.ndarray
+    certs: np.ndarray
+    categories: np.ndarray
+
+def _boosted_scores(base_scores: np.ndarray, title_matches: np.ndarray,
+                    summary_matches: np.ndarray, query_length: int) -> np.ndarray:
+    """Vectorized relevance boost: +0.3 per title hit ratio, +0.1 per summary hit ratio, capped at 1"""
+    return np.minimum(base_scores + (title_matches / query_length) * 0.3
+                      + (summary_matches / query_length) * 0.1, 1.0)
+
+def _membership_matrix(rows: List[Tuple[int, ...]], width: int) -> np.ndarray:
+    """Expand per-document code tuples into a (documents x codes) boolean matrix"""
+    matrix = np.zeros((len(rows), width), dtype=bool)
+    for index, codes in enumerate(rows):
+        matrix[index, list(codes)] = True
+    return matrix
+
 class DocumentSearchService:
     def __init__(self):
         # Mock search results database
@@ -67,6 +131,103 @@ class DocumentSearchService:
                 "softwareType": "Cisco ASA"
             }
         ]
+        
+        # Mock latency is opt-in (SIMULATE_LATENCY=1) so it never caps real throughput
+        self._simulate_latency = os.getenv("SIMULATE_LATENCY", "0") == "1"
+        
+        # Index documents by id for O(1) lookups, plus word -> positions postings
+        # for the title and summary text used by relevance scoring
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._title_postings: Dict[str, List[int]] = {}
+        self._summary_postings: Dict[str, List[int]] = {}
+        self._doc_categories: Dict[str, Tuple[str, ...]] = {}
+        
+        # Struct-of-arrays view of the filterable fields: each categorical value
+        # gets an integer code, rows are appended per document and turned into
+        # NumPy columns on demand for vectorized filtering
+        self._positions: Dict[str, int] = {}
+        self._doctype_codes: Dict[str, int] = {}
+        self._software_codes: Dict[str, int] = {}
+        self._cert_codes: Dict[str, int] = {}
+        self._category_codes: Dict[str, int] = {}
+        self._score_rows: List[float] = []
+        self._doctype_rows: List[int] = []
+        self._software_rows: List[int] = []
+        self._cert_rows: List[Tuple[int, ...]] = []
+        self._category_rows: List[Tuple[int, ...]] = []
+        self._columns: Optional[_SearchColumns] = None
+        
+        # Query word -> (title hits, summary hits) masks, LRU ordered; reset when the corpus grows
+        self._word_hit_cache: "OrderedDict[str, Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+        
+        for index, document in enumerate(self.search_results):
+            self._index_document(index, document)
+        
+        # Per-session (last query, matching suggestion indices), LRU ordered
+        self._suggestion_loci: "OrderedDict[str, Tuple[str, Tuple[int, ...]]]" = OrderedDict()
+    
+    async def _maybe_sleep(self, seconds: float) -> None:
+        """Sleep only when simulated latency is enabled"""
+        if self._simulate_latency:
+            await asyncio.sleep(seconds)
+    
+    def add_document(self, document: Dict[str, Any]) -> None:
+        """Add a document to the search corpus, keeping the indexes in sync"""
+        self._index_document(len(self.search_results), document)
+        self.search_results.append(document)
+    
+    def _index_document(self, index: int, document: Dict[str, Any]) -> None:
+        """Register the document at position index in every search index
+        
+        Every field is read and derived before any index is touched, so a
+        rejected document (duplicate id, missing field) leaves them unchanged.
+        """
+        # Every side table is keyed by id, so a duplicate would silently shadow a document
+        doc_id = document["id"]
+        if doc_id in self._by_id:
+            raise ValueError(f"Duplicate document id {doc_id}")
+        
+        title_words = set(document["title"].lower().split())
+        summary_words = set(document["summary"].lower().split())
+        categories = tuple(self._extract_technology_categories(document))
+        score = float(document["relevanceScore"])
+        # New codes only widen the code tables; an unused code is harmless
+        doctype_code = self._doctype_codes.setdefault(document["documentType"], len(self._doctype_codes))
+        software_code = self._software_codes.setdefault(document["softwareType"].lower(), len(self._software_codes))
+        cert_codes = tuple(
+            self._cert_codes.setdefault(cert, len(self._cert_codes)) for cert in document["certificationLevel"]
+        )
+        category_codes = tuple(
+            self._category_codes.setdefault(category, len(self._category_codes)) for category in categories
+        )
+        
+        self._by_id[doc_id] = document
+        for word in title_words:
+            self._title_postings.setdefault(word, []).append(index)
+        for word in summary_words:
+            self._summary_postings.setdefault(word, []).append(index)
+        self._doc_categories[doc_id] = categories
+        
+        self._positions[doc_id] = index
+        self._score_rows.append(score)
+        self._doctype_rows.append(doctype_code)
+        self._software_rows.append(software_code)
+        self._cert_rows.append(cert_codes)
+        self._category_rows.append(category_codes)
+        self._columns = None
+        self._word_hit_cache.clear()
+    
+    def _get_columns(self) -> "_SearchColumns":
+        """Return the NumPy columns, rebuilding them after documents were added"""
+        if self._columns is None:
+            self._columns = _SearchColumns(
+                scores=np.array(self._score_rows, dtype=np.float64),
+                doctypes=np.array(self._doctype_rows, dtype=np.int32),
+                software=np.array(self._software_rows, dtype=np.int32),
+                certs=_membership_matrix(self._cert_rows, len(self._cert_codes)),
+                categories=_membership_matrix(self._category_rows, len(self._category_codes))
+            )
+        return self._columns
     
     async def search_documents(self, query: str, relevance_threshold: int = 70,
                              cert_level: str = "all", doc_type: str = "all",
@@ -75,183 +236,223 @@ class DocumentSearchService:
         """Search documents based on query and filters"""
         
         # Simulate search delay
-        await asyncio.sleep(1.5)
+        await self._maybe_sleep(1.5)
         
-        # Filter results based on criteria
-        filtered_results = self._filter_results(
+        indices, scores = self._score_documents(
             query, relevance_threshold, cert_level, doc_type, software_type, date_range
         )
         
-        # Calculate relevance scores based on query
-        scored_results = self._calculate_relevance(filtered_results, query)
+        # Sort by relevance score (stable, so ties keep corpus order)
+        order = np.argsort(-scores, kind="stable")
         
-        # Sort by relevance score
-        sorted_results = sorted(scored_results, key=lambda x: x["relevanceScore"], reverse=True)
+        return self._materialize(indices[order], scores[order])
+    
+    def _score_documents(self, query: str, relevance_threshold: int = 70, cert_level: str = "all",
+                         doc_type: str = "all", software_type: str = "Cisco IOS",
+                         date_range: str = "all") -> Tuple[np.ndarray, np.ndarray]:
+        """Return surviving corpus positions and their boosted scores, in corpus order"""
+        # Filter results based on criteria
+        indices = self._filter_results(
+            query, relevance_threshold, cert_level, doc_type, software_type, date_range
+        )
         
-        return sorted_results
+        # Calculate relevance scores based on query (normalized once per search)
+        return indices, self._calculate_relevance(indices, tuple(query.lower().split()))
+    
+    def _materialize(self, indices: np.ndarray, scores: np.ndarray) -> List[Dict[str, Any]]:
+        """Build result dicts; documents are only copied here, at the API boundary"""
+        return [
+            {**self.search_results[index], "relevanceScore": score}
+            for index, score in zip(indices.tolist(), scores.tolist())
+        ]
     
     def _filter_results(self, query: str, relevance_threshold: int, cert_level: str,
-                       doc_type: str, software_type: str, date_range: str) -> List[Dict[str, Any]]:
-        """Filter search results based on criteria"""
-        filtered = []
-        
-        for result in self.search_results:
-            # Relevance threshold filter
-            if result["relevanceScore"] * 100 < relevance_threshold:
-                continue
-            
-            # Certification level filter
-            if cert_level != "all":
-                if cert_level.upper() not in [cert.upper() for cert in result["certificationLevel"]]:
-                    continue
-            
-            # Document type filter
-            if doc_type != "all":
-                if result["documentType"] != doc_type:
-                    continue
-            
-            # Software type filter (partial match)
-            if software_type != "all":
-                if software_type.lower() not in result["softwareType"].lower():
-                    continue
-            
-            # Date range filter (simplified)
-            if date_range != "all":
-                # In production, implement proper date filtering
-                pass
-            
-            filtered.append(result.copy())
+                       doc_type: str, software_type: str, date_range: str) -> np.ndarray:
+        """Filter search results based on criteria, returning surviving corpus positions"""
+        columns = self._get_columns()
+        
+        # Relevance threshold filter
+        mask = columns.scores * 100 >= relevance_threshold
+        
+        # Certification level filter (case-insensitive)
+        if cert_level != "all":
+            cert_upper = cert_level.upper()
+            cert_columns = [code for cert, code in self._cert_codes.items() if cert.upper() == cert_upper]
+            mask &= columns.certs[:, cert_columns].any(axis=1)
         
-        return filtered
+        # Document type filter
+        if doc_type != "all":
+            mask &= columns.doctypes == self._doctype_codes.get(doc_type, -1)
+        
+        # Software type filter (partial match against each distinct software type)
+        if software_type != "all":
+            software_lower = software_type.lower()
+            mask &= np.isin(columns.software, [
+                code for software, code in self._software_codes.items() if software_lower in software
+            ])
+        
+        # Date range filter (simplified)
+        if date_range != "all":
+            # In production, implement proper date filtering
+            pass
+        
+        return np.flatnonzero(mask)
     
-    def _calculate_relevance(self, results: List[Dict[str, Any]], query: str) -> List[Dict[str, Any]]:
-        """Calculate relevance scores based on query"""
-        query_words = query.lower().split()
+    def _calculate_relevance(self, indices: np.ndarray, query_words: Tuple[str, ...]) -> np.ndarray:
+        """Calculate relevance scores for lowercased query words, aligned with indices"""
+        base_scores = self._get_columns().scores[indices]
         
-        for result in results:
-            # Calculate relevance based on title and summary matches
-            title_words = result["title"].lower().split()
-            summary_words = result["summary"].lower().split()
-            
-            title_matches = sum(1 for word in query_words if any(word in title_word for title_word in title_words))
-            summary_matches = sum(1 for word in query_words if any(word in summary_word for summary_word in summary_words))
-            
-            # Boost score based on matches
-            base_score = result["relevanceScore"]
-            title_boost = (title_matches / len(query_words)) * 0.3
-            summary_boost = (summary_matches / len(query_words)) * 0.1
-            
-            result["relevanceScore"] = min(base_score + title_boost + summary_boost, 1.0)
+        # Nothing to boost (and no words to divide by)
+        if not len(indices) or not query_words:
+            return base_scores
+        
+        # Count, per surviving document, how many query words hit its title and summary
+        title_matches = np.zeros(len(indices), dtype=np.int64)
+        summary_matches = np.zeros(len(indices), dtype=np.int64)
+        # Repeated query words count once per occurrence but are looked up only once
+        for word, occurrences in Counter(query_words).items():
+            title_hits, summary_hits = self._query_word_hits(word)
+            title_matches += title_hits[indices] * occurrences
+            summary_matches += summary_hits[indices] * occurrences
         
-        return results
+        # Boost score based on matches
+        return _boosted_scores(base_scores, title_matches, summary_matches, len(query_words))
+    
+    def _query_word_hits(self, word: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Title and summary hit masks for a query word, cached across searches"""
+        cached = self._word_hit_cache.get(word)
+        if cached is not None:
+            self._word_hit_cache.move_to_end(word)
+            return cached
+        
+        corpus_size = len(self.search_results)
+        cached = (
+            self._word_hits(word, self._title_postings, corpus_size),
+            self._word_hits(word, self._summary_postings, corpus_size)
+        )
+        self._word_hit_cache[word] = cached
+        if len(self._word_hit_cache) > _MAX_CACHED_QUERY_WORDS:
+            self._word_hit_cache.popitem(last=False)
+        return cached
+    
+    def _word_hits(self, word: str, postings: Dict[str, List[int]], corpus_size: int) -> np.ndarray:
+        """Mark documents having a word that contains the query word"""
+        hits = np.zeros(corpus_size, dtype=bool)
+        for token, token_positions in postings.items():
+            if word in token:
+                hits[token_positions] = True
+        return hits
     
     async def get_document_content(self, document_id: str) -> Dict[str, Any]:
         """Get content of a specific document"""
         # Find document
-        doc = next((d for d in self.search_results if d["id"] == document_id), None)
-        if not doc:
+        doc = self._by_id.get(document_id)
+        if doc is None:
             raise ValueError(f"Document {document_id} not found")
         
         # Simulate content retrieval
-        await asyncio.sleep(0.5)
+        await self._maybe_sleep(0.5)
         
         # Return document with content
         return {
             **doc,
             "content": f"This is the content of {doc['title']}. In a real implementation, this would contain the actual document text.",
             "contentType": "text/plain",
-            "retrievedAt": datetime.now().isoformat()
+            "retrievedAt": now_iso()
         }
     
     async def download_document(self, document_id: str) -> Dict[str, Any]:
         """Download a specific document"""
-        doc = next((d for d in self.search_results if d["id"] == document_id), None)
-        if not doc:
+        doc = self._by_id.get(document_id)
+        if doc is None:
             raise ValueError(f"Document {document_id} not found")
         
         # Simulate download
-        await asyncio.sleep(2)
+        await self._maybe_sleep(2)
         
         return {
             "id": document_id,
             "status": "downloaded",
             "downloadPath": doc["localPath"],
-            "downloadedAt": datetime.now().isoformat()
+            "downloadedAt": now_iso()
         }
     
-    async def get_search_suggestions(self, partial_query: str) -> List[str]:
-        """Get search suggestions based on partial query"""
-        suggestions = [
-            "BGP configuration",
-            "OSPF troubleshooting",
-            "MPLS VPN setup",
-            "ASA firewall rules",
-            "QoS implementation",
-            "EIGRP optimization",
-            "VLAN configuration",
-            "Spanning tree protocol",
-            "Cisco IOS XE configuration",
-            "Network security best practices",
-            "Wireless controller setup",
-            "Voice over IP configuration",
-            "Data center switching",
-            "Service provider routing"
-        ]
+    async def get_search_suggestions(self, partial_query: str, session_id: Optional[str] = None) -> List[str]:
+        """Get search suggestions based on partial query
         
-        # Filter suggestions based on partial query
-        if partial_query:
-            filtered = [s for s in suggestions if partial_query.lower() in s.lower()]
-            return filtered[:5]
+        Passing a session_id lets consecutive keystrokes rescan only the
+        suggestions that matched the previous (shorter) query.
+        """
+        return [suggestion async for suggestion in self.stream_suggestions(partial_query, session_id=session_id)]
+    
+    async def stream_suggestions(self, partial_query: str, k: int = _MAX_SUGGESTIONS,
+                                 session_id: Optional[str] = None) -> AsyncGenerator[str, None]:
+        """Yield up to k suggestions for partial_query as they are found
+        
+        Autocomplete callers can consume this per keystroke and cancel the
+        consuming task when the user types another character.
+        """
+        if not partial_query:
+            matches = range(len(_SEARCH_SUGGESTIONS))
+        else:
+            matches = self._find_suggestion_matches(partial_query.lower(), session_id)
         
-        return suggestions[:5]
+        for index in matches[:k]:
+            yield _SEARCH_SUGGESTIONS[index]
+    
+    def _find_suggestion_matches(self, query: str, session_id: Optional[str]) -> Tuple[int, ...]:
+        """Indices of suggestions containing query, narrowing the session's last matches
+        
+        A suggestion containing the extended query also contains the query it
+        extends, so typing on only rescans the previous keystroke's matches.
+        """
+        candidates = range(len(_SEARCH_SUGGESTIONS_LOWER))
+        if session_id is not None:
+            cached = self._suggestion_loci.get(session_id)
+            if cached and query.startswith(cached[0]):
+                candidates = cached[1]
+        
+        matches = tuple(index for index in candidates if query in _SEARCH_SUGGESTIONS_LOWER[index])
+        
+        if session_id is not None:
+            self._suggestion_loci[session_id] = (query, matches)
+            self._suggestion_loci.move_to_end(session_id)
+            if len(self._suggestion_loci) > _MAX_SUGGESTION_SESSIONS:
+                self._suggestion_loci.popitem(last=False)
+        
+        return matches
     
     async def search_with_facets(self, query: str, facets: Dict[str, List[str]] = None,
                                 date_range: Dict[str, str] = None, sort_by: str = "relevance") -> Dict[str, Any]:
         """Advanced search with faceted navigation"""
         
-        # Perform base search
-        base_results = await self.search_documents(query)
+        # Simulate search delay
+        await self._maybe_sleep(1.5)
+        
+        # Perform base search on positions; documents are copied only once at the end
+        indices, scores = self._score_documents(query)
         
         # Apply facet filters
         if facets:
-            filtered_results = []
-            for result in base_results:
-                include_result = True
-                
-                # Check certification level facet
-                if "certification_levels" in facets and facets["certification_levels"]:
-                    if not any(cert in result["certificationLevel"] for cert in facets["certification_levels"]):
-                        include_result = False
-                
-                # Check technology category facet
-                if "technology_categories" in facets and facets["technology_categories"]:
-                    # Simulate technology categorization based on title/summary
-                    doc_categories = self._extract_technology_categories(result)
-                    if not any(cat in doc_categories for cat in facets["technology_categories"]):
-                        include_result = False
-                
-                # Check document type facet
-                if "document_types" in facets and facets["document_types"]:
-                    if result["documentType"] not in facets["document_types"]:
-                        include_result = False
-                
-                if include_result:
-                    filtered_results.append(result)
-            
-            base_results = filtered_results
+            keep = self._facet_mask(facets)[indices]
+            indices, scores = indices[keep], scores[keep]
         
         # Apply date range filter
         if date_range:
             # In production, implement proper date filtering
             pass
         
-        # Apply sorting
-        if sort_by == "relevance":
-            base_results.sort(key=lambda x: x["relevanceScore"], reverse=True)
-        elif sort_by == "date":
-            base_results.sort(key=lambda x: x["dateAdded"], reverse=True)
+        # Apply sorting in a single pass; relevance breaks date/title ties
+        if sort_by == "date":
+            order = sorted(range(len(indices)), reverse=True,
+                           key=lambda j: (self.search_results[indices[j]]["dateAdded"], scores[j]))
         elif sort_by == "title":
-            base_results.sort(key=lambda x: x["title"])
+            order = sorted(range(len(indices)),
+                           key=lambda j: (self.search_results[indices[j]]["title"], -scores[j]))
+        else:
+            order = np.argsort(-scores, kind="stable")
+        
+        base_results = self._materialize(indices[order], scores[order])
         
         # Generate facet counts
         facet_counts = self._generate_facet_counts(base_results)
@@ -265,53 +466,60 @@ class DocumentSearchService:
             "sort_by": sort_by
         }
     
+    def _facet_mask(self, facets: Dict[str, List[str]]) -> np.ndarray:
+        """Boolean mask over the corpus of documents matching every requested facet"""
+        columns = self._get_columns()
+        mask = np.ones(len(columns.scores), dtype=bool)
+        
+        # Check certification level facet
+        if facets.get("certification_levels"):
+            cert_columns = [self._cert_codes[cert] for cert in facets["certification_levels"] if cert in self._cert_codes]
+            mask &= columns.certs[:, cert_columns].any(axis=1)
+        
+        # Check technology category facet (categories are cached per document)
+        if facets.get("technology_categories"):
+            category_columns = [
+                self._category_codes[category] for category in facets["technology_categories"]
+                if category in self._category_codes
+            ]
+            mask &= columns.categories[:, category_columns].any(axis=1)
+        
+        # Check document type facet
+        if facets.get("document_types"):
+            mask &= np.isin(columns.doctypes, [
+                self._doctype_codes[doc_type] for doc_type in facets["document_types"] if doc_type in self._doctype_codes
+            ])
+        
+        return mask
+    
     def _extract_technology_categories(self, document: Dict[str, Any]) -> List[str]:
         """Extract technology categories from document"""
         categories = []
-        title_lower = document["title"].lower()
-        summary_lower = document["summary"].lower()
-        
-        category_keywords = {
-            "Routing": ["bgp", "ospf", "eigrp", "rip", "routing", "route"],
-            "Switching": ["vlan", "stp", "spanning", "switch", "switching"],
-            "Security": ["asa", "firewall", "acl", "security", "vpn"],
-            "Wireless": ["wireless", "wifi", "wlan", "access point", "controller"],
-            "Voice": ["voice", "voip", "cucm", "unity", "telephony"],
-            "Data Center": ["nexus", "data center", "datacenter", "fabric"],
-            "Service Provider": ["mpls", "service provider", "carrier", "isp"]
-        }
+        # One lowercase pass; the newline keeps keywords from matching across fields
+        text_lower = (document["title"] + "\n" + document["summary"]).lower()
         
-        for category, keywords in category_keywords.items():
-            if any(keyword in title_lower or keyword in summary_lower for keyword in keywords):
+        for category, pattern in _CATEGORY_PATTERNS:
+            if pattern.search(text_lower):
                 categories.append(category)
         
         return categories if categories else ["General"]
     
     def _generate_facet_counts(self, results: List[Dict[str, Any]]) -> Dict[str, Dict[str, int]]:
         """Generate facet counts for search results"""
-        facet_counts = {
-            "certification_levels": {},
-            "technology_categories": {},
-            "document_types": {},
-            "sources": {}
-        }
+        certification_levels = Counter()
+        technology_categories = Counter()
         
         for result in results:
             # Count certification levels
-            for cert in result["certificationLevel"]:
-                facet_counts["certification_levels"][cert] = facet_counts["certification_levels"].get(cert, 0) + 1
+            certification_levels.update(result["certificationLevel"])
             
             # Count technology categories
-            categories = self._extract_technology_categories(result)
-            for category in categories:
-                facet_counts["technology_categories"][category] = facet_counts["technology_categories"].get(category, 0) + 1
-            
-            # Count document types
-            doc_type = result["documentType"]
-            facet_counts["document_types"][doc_type] = facet_counts["document_types"].get(doc_type, 0) + 1
-            
-            # Count sources
-            source = result["source"]
-            facet_counts["sources"][source] = facet_counts["sources"].get(source, 0) + 1
+            technology_categories.update(self._doc_categories[result["id"]])
         
-        return facet_counts
+        return {
+            "certification_levels": dict(certification_levels),
+            "technology_categories": dict(technology_categories),
+            # Count document types and sources
+            "document_types": dict(Counter(result["documentType"] for result in results)),
+            "sources": dict(Counter(result["source"] for result in results))
+        }
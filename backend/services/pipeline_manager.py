@@ -5,35 +5,141 @@ Pipeline Manager Service - Handles Stage 1 and Stage 2 processing
 import asyncio
 import logging
 from typing import Dict, List, Any, AsyncGenerator
-from datetime import datetime
+from dataclasses import dataclass, asdict
+from services.timestamps import now_iso
 import json
+import os
+import time
 
 logger = logging.getLogger(__name__)
 
+# Progress events are coalesced: emit only after this much progress (percent)
+# or this much wall-clock time (seconds), plus always the final step
+_MIN_PROGRESS_DELTA = 1.0
+_MIN_EMIT_INTERVAL = 0.25
+
+# Phase-specific Stage 2 steps
+_PHASE_STEPS = {
+    1: (
+        "Checking GPU availability (Ollama/Groq)...",
+        "Extracting text from seed PDF...",
+        "Generating synthetic error patterns (GPU)...",
+        "Creating best practices library (GPU)...",
+        "Generating troubleshooting scenarios (GPU)...",
+        "Building configuration examples (GPU)...",
+        "Combining real + synthetic data...",
+        "Creating high-density embeddings (GPU)...",
+        "Optimizing for basic RAG accuracy...",
+        "Finalizing basic Chroma vector store..."
+    ),
+    2: (
+        "Initializing Hierarchical Index structure...",
+        "Parsing configurations into structured chunks...",
+        "Building device memory filters...",
+        "Creating feature-area taxonomies...",
+        "Implementing version-aware filtering...",
+        "Optimizing retrieval precision...",
+        "Building foundational index (80-88% accuracy)...",
+        "Finalizing hierarchical vector store..."
+    ),
+    3: (
+        "Building Graph RAG knowledge graph...",
+        "Creating device-feature relationships...",
+        "Mapping error-solution dependencies...",
+        "Building version compatibility graph...",
+        "Implementing graph-aware retrieval...",
+        "Optimizing for dependency nuance...",
+        "Achieving low 90s accuracy target...",
+        "Finalizing Graph RAG layer..."
+    ),
+    4: (
+        "Initializing Agentic Loop framework...",
+        "Building tool execution pipeline...",
+        "Creating hypothesis validation system...",
+        "Implementing iterative evidence gathering...",
+        "Building command execution interface...",
+        "Creating validated case repository...",
+        "Optimizing for upper 90s accuracy...",
+        "Finalizing Agentic Loop system..."
+    ),
+    5: (
+        "Setting up continuous evaluation harness...",
+        "Building gold standard test sets...",
+        "Implementing regression monitoring...",
+        "Creating feedback capture system...",
+        "Building automated hardening pipeline...",
+        "Implementing accuracy maintenance...",
+        "Achieving ≥95% in-scope accuracy...",
+        "Finalizing continuous eval system..."
+    )
+}
+
+def _should_emit(progress: float, last_progress: float, last_emit_time: float, is_final: bool) -> bool:
+    """Decide whether a progress update is worth sending to clients"""
+    return (is_final
+            or progress - last_progress >= _MIN_PROGRESS_DELTA
+            or time.monotonic() - last_emit_time >= _MIN_EMIT_INTERVAL)
+
+@dataclass(slots=True)
+class Stage1Status:
+    """Live Stage 1 status, updated in place by run_stage1"""
+    status: str = "idle"
+    progress: float = 0
+    documents_found: int = 0
+    current_step: str = "Ready to start document discovery"
+
+@dataclass(slots=True)
+class Stage2Status:
+    """Live Stage 2 status, updated in place by run_stage2"""
+    status: str = "idle"
+    progress: float = 0
+    synthetic_examples: int = 0
+    current_step: str = "Waiting for Stage 1 completion"
+    output_phase: int = 1
+
+@dataclass(slots=True, frozen=True)
+class Stage1Progress:
+    """Progress event yielded by run_stage1"""
+    stage: int
+    status: str
+    progress: float
+    current_step: str
+    documents_found: int
+    discovered_pdfs: List[str]
+
+@dataclass(slots=True, frozen=True)
+class Stage2Progress:
+    """Progress event yielded by run_stage2"""
+    stage: int
+    status: str
+    progress: float
+    current_step: str
+    synthetic_examples: int
+    output_phase: int
+    processed_files: int
+    total_files: int
+
 class PipelineManager:
     def __init__(self):
-        self.stage1_status = {
-            "status": "idle",
-            "progress": 0,
-            "documents_found": 0,
-            "current_step": "Ready to start document discovery"
-        }
-        self.stage2_status = {
-            "status": "idle",
-            "progress": 0,
-            "synthetic_examples": 0,
-            "current_step": "Waiting for Stage 1 completion",
-            "output_phase": 1
-        }
+        self.stage1_status = Stage1Status()
+        self.stage2_status = Stage2Status()
+        
+        # Mock latency is opt-in (SIMULATE_LATENCY=1) so it never caps real throughput
+        self._simulate_latency = os.getenv("SIMULATE_LATENCY", "0") == "1"
+    
+    async def _maybe_sleep(self, seconds: float) -> None:
+        """Sleep only when simulated latency is enabled"""
+        if self._simulate_latency:
+            await asyncio.sleep(seconds)
     
-    async def run_stage1(self, topic: str, config: Dict[str, Any] = None) -> AsyncGenerator[Dict[str, Any], None]:
+    async def run_stage1(self, topic: str, config: Dict[str, Any] = None) -> AsyncGenerator[Stage1Progress, None]:
         """Run Stage 1: Document Discovery Agent"""
         
         if config is None:
             config = {}
         
-        self.stage1_status["status"] = "running"
-        self.stage1_status["progress"] = 0
+        self.stage1_status.status = "running"
+        self.stage1_status.progress = 0
         
         steps = [
             "Initializing document discovery...",
@@ -45,9 +151,11 @@ class PipelineManager:
         ]
         
         discovered_pdfs = []
+        last_progress = -1.0
+        last_emit_time = time.monotonic()
         
         for i, step in enumerate(steps):
-            await asyncio.sleep(2)  # Simulate processing time
+            await self._maybe_sleep(2)  # Simulate processing time
             
             progress = ((i + 1) / len(steps)) * 100
             documents_found = 0
@@ -61,27 +169,29 @@ class PipelineManager:
                     "ASR_1000_Troubleshooting_Guide.pdf",
                     "CCNP_Enterprise_Core_Study_Guide.pdf"
                 ]
-                self.stage1_status["status"] = "completed"
+                self.stage1_status.status = "completed"
             else:
-                self.stage1_status["status"] = "running"
+                self.stage1_status.status = "running"
+            
+            self.stage1_status.progress = progress
+            self.stage1_status.current_step = step
+            self.stage1_status.documents_found = documents_found
             
-            self.stage1_status.update({
-                "progress": progress,
-                "current_step": step,
-                "documents_found": documents_found
-            })
+            if not _should_emit(progress, last_progress, last_emit_time, i == len(steps) - 1):
+                continue
+            last_progress, last_emit_time = progress, time.monotonic()
             
-            yield {
-                "stage": 1,
-                "status": self.stage1_status["status"],
-                "progress": progress,
-                "current_step": step,
-                "documents_found": documents_found,
-                "discovered_pdfs": discovered_pdfs if i == len(steps) - 1 else []
-            }
+            yield Stage1Progress(
+                stage=1,
+                status=self.stage1_status.status,
+                progress=progress,
+                current_step=step,
+                documents_found=documents_found,
+                discovered_pdfs=discovered_pdfs if i == len(steps) - 1 else []
+            )
     
     async def run_stage2(self, pdf_files: List[str], output_phase: int = 1, 
-                        config: Dict[str, Any] = None) -> AsyncGenerator[Dict[str, Any], None]:
+                        config: Dict[str, Any] = None) -> AsyncGenerator[Stage2Progress, None]:
         """Run Stage 2: Fine-Tuning Data Factory"""
         
         if config is None:
@@ -90,77 +200,25 @@ class PipelineManager:
         if not pdf_files:
             raise ValueError("No PDF files provided for Stage 2")
         
-        self.stage2_status.update({
-            "status": "running",
-            "progress": 0,
-            "output_phase": output_phase,
-            "current_step": f"Initializing PHASE {output_phase} processing for {len(pdf_files)} file{'s' if len(pdf_files) > 1 else ''}..."
-        })
-        
-        # Define phase-specific steps
-        phase_steps = {
-            1: [
-                "Checking GPU availability (Ollama/Groq)...",
-                "Extracting text from seed PDF...",
-                "Generating synthetic error patterns (GPU)...",
-                "Creating best practices library (GPU)...",
-                "Generating troubleshooting scenarios (GPU)...",
-                "Building configuration examples (GPU)...",
-                "Combining real + synthetic data...",
-                "Creating high-density embeddings (GPU)...",
-                "Optimizing for basic RAG accuracy...",
-                "Finalizing basic Chroma vector store..."
-            ],
-            2: [
-                "Initializing Hierarchical Index structure...",
-                "Parsing configurations into structured chunks...",
-                "Building device memory filters...",
-                "Creating feature-area taxonomies...",
-                "Implementing version-aware filtering...",
-                "Optimizing retrieval precision...",
-                "Building foundational index (80-88% accuracy)...",
-                "Finalizing hierarchical vector store..."
-            ],
-            3: [
-                "Building Graph RAG knowledge graph...",
-                "Creating device-feature relationships...",
-                "Mapping error-solution dependencies...",
-                "Building version compatibility graph...",
-                "Implementing graph-aware retrieval...",
-                "Optimizing for dependency nuance...",
-                "Achieving low 90s accuracy target...",
-                "Finalizing Graph RAG layer..."
-            ],
-            4: [
-                "Initializing Agentic Loop framework...",
-                "Building tool execution pipeline...",
-                "Creating hypothesis validation system...",
-                "Implementing iterative evidence gathering...",
-                "Building command execution interface...",
-                "Creating validated case repository...",
-                "Optimizing for upper 90s accuracy...",
-                "Finalizing Agentic Loop system..."
-            ],
-            5: [
-                "Setting up continuous evaluation harness...",
-                "Building gold standard test sets...",
-                "Implementing regression monitoring...",
-                "Creating feedback capture system...",
-                "Building automated hardening pipeline...",
-                "Implementing accuracy maintenance...",
-                "Achieving ≥95% in-scope accuracy...",
-                "Finalizing continuous eval system..."
-            ]
-        }
+        self.stage2_status.status = "running"
+        self.stage2_status.progress = 0
+        self.stage2_status.output_phase = output_phase
+        self.stage2_status.current_step = f"Initializing PHASE {output_phase} processing for {len(pdf_files)} file{'s' if len(pdf_files) > 1 else ''}..."
         
-        steps = phase_steps.get(output_phase, phase_steps[1])
+        steps = _PHASE_STEPS.get(output_phase, _PHASE_STEPS[1])
         total_steps = len(steps) * len(pdf_files)
         current_step_index = 0
+        last_progress = -1.0
+        last_emit_time = time.monotonic()
+        max_examples = 15000 * len(pdf_files)
         
         # Process each PDF file sequentially
         for file_index, pdf_file in enumerate(pdf_files):
+            file_prefix = f"[File {file_index + 1}/{len(pdf_files)}: {pdf_file}] " if len(pdf_files) > 1 else ""
+            file_salt = hash(pdf_file) % 500
+            
             for step_index, step in enumerate(steps):
-                await asyncio.sleep(2.5)  # Simulate processing time
+                await self._maybe_sleep(2.5)  # Simulate processing time
                 
                 current_step_index += 1
                 progress = (current_step_index / total_steps) * 100
@@ -168,58 +226,48 @@ class PipelineManager:
                 # Simulate synthetic data generation
                 synthetic_examples = 0
                 if step_index >= 2:  # After initial steps
-                    base_examples = int((2 ** step_index) * 250) + (hash(pdf_file) % 500)
-                    synthetic_examples = min(base_examples * (file_index + 1), 15000 * len(pdf_files))
+                    base_examples = (1 << step_index) * 250 + file_salt
+                    synthetic_examples = min(base_examples * (file_index + 1), max_examples)
                 
-                current_step = step
-                if len(pdf_files) > 1:
-                    current_step = f"[File {file_index + 1}/{len(pdf_files)}: {pdf_file}] {step}"
+                current_step = file_prefix + step if file_prefix else step
                 
                 status = "completed" if current_step_index == total_steps else "running"
                 
-                self.stage2_status.update({
-                    "status": status,
-                    "progress": progress,
-                    "current_step": current_step,
-                    "synthetic_examples": synthetic_examples
-                })
+                self.stage2_status.status = status
+                self.stage2_status.progress = progress
+                self.stage2_status.current_step = current_step
+                self.stage2_status.synthetic_examples = synthetic_examples
+                
+                # Status stays live every step; clients only get coalesced updates
+                if not _should_emit(progress, last_progress, last_emit_time, current_step_index == total_steps):
+                    continue
+                last_progress, last_emit_time = progress, time.monotonic()
                 
-                yield {
-                    "stage": 2,
-                    "status": status,
-                    "progress": progress,
-                    "current_step": current_step,
-                    "synthetic_examples": synthetic_examples,
-                    "output_phase": output_phase,
-                    "processed_files": file_index + 1 if step_index == len(steps) - 1 else file_index,
-                    "total_files": len(pdf_files)
-                }
+                yield Stage2Progress(
+                    stage=2,
+                    status=status,
+                    progress=progress,
+                    current_step=current_step,
+                    synthetic_examples=synthetic_examples,
+                    output_phase=output_phase,
+                    processed_files=file_index + 1 if step_index == len(steps) - 1 else file_index,
+                    total_files=len(pdf_files)
+                )
         
         # Mark as completed
-        self.stage2_status["status"] = "completed"
+        self.stage2_status.status = "completed"
     
     async def get_pipeline_status(self) -> Dict[str, Any]:
         """Get current pipeline status"""
         return {
-            "stage1": self.stage1_status.copy(),
-            "stage2": self.stage2_status.copy(),
-            "timestamp": datetime.now().isoformat()
+            "stage1": asdict(self.stage1_status),
+            "stage2": asdict(self.stage2_status),
+            "timestamp": now_iso()
         }
     
     async def reset_pipeline(self):
         """Reset pipeline to initial state"""
-        self.stage1_status = {
-            "status": "idle",
-            "progress": 0,
-            "documents_found": 0,
-            "current_step": "Ready to start document discovery"
-        }
-        self.stage2_status = {
-            "status": "idle",
-            "progress": 0,
-            "synthetic_examples": 0,
-            "current_step": "Waiting for Stage 1 completion",
-            "output_phase": 1
-        }
+        self.stage1_status = Stage1Status()
+        self.stage2_status = Stage2Status()
         
         logger.info("Pipeline reset to initial state")
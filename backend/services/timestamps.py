@@ -0,0 +1,43 @@
+"""
+Timestamp helpers shared by the services
+"""
+
+import time
+from datetime import datetime
+from functools import lru_cache
+
+# Output styles; isoformat is a C fast path, unlike the locale-aware strftime
+_FORMATTERS = {
+    "iso": datetime.isoformat,
+    "datetime": lambda moment: moment.isoformat(sep=" ", timespec="seconds"),
+    "clock": lambda moment: moment.time().isoformat(timespec="seconds"),
+}
+
+
+@lru_cache(maxsize=8)
+def _format_second(second: int, style: str) -> str:
+    """Format a whole epoch second as local time in one of the _FORMATTERS styles"""
+    return _FORMATTERS[style](datetime.fromtimestamp(second))
+
+
+# (second, ISO string) for the hottest caller, checked before the LRU lookup
+_last_iso = (-1, "")
+
+
+def now_iso() -> str:
+    """Current local time as ISO-8601, formatted at most once per second"""
+    global _last_iso
+    second = time.time_ns() // 1_000_000_000
+    if _last_iso[0] != second:
+        _last_iso = (second, _format_second(second, "iso"))
+    return _last_iso[1]
+
+
+def now_datetime() -> str:
+    """Current local time as "YYYY-MM-DD HH:MM:SS", formatted at most once per second"""
+    return _format_second(int(time.time()), "datetime")
+
+
+def now_clock() -> str:
+    """Current local time of day as "HH:MM:SS", formatted at most once per second"""
+    return _format_second(int(time.time()), "clock")
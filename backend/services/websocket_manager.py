@@ -2,28 +2,43 @@
 WebSocket Manager for real-time communication with frontend
 """
 
-import json
+import asyncio
 import logging
-from typing import Dict, Any
+import orjson
+from typing import Dict, Any, Tuple
 from fastapi import WebSocket
-from datetime import datetime
+from types import MappingProxyType
+from services.timestamps import now_iso
 
 logger = logging.getLogger(__name__)
 
+# Match json.dumps leniency for int keys and numpy values coming from the services
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+def _encode_default(obj: Any) -> Any:
+    """Encode read-only config views, which orjson does not know natively"""
+    if isinstance(obj, MappingProxyType):
+        return dict(obj)
+    raise TypeError
+
 class WebSocketManager:
     def __init__(self):
         self.active_connections: Dict[str, WebSocket] = {}
+        # (client_id, websocket) pairs for broadcast, rebuilt only on connect/disconnect
+        self._connection_snapshot: Tuple[Tuple[str, WebSocket], ...] = ()
     
     async def connect(self, websocket: WebSocket, client_id: str):
         """Accept WebSocket connection"""
         await websocket.accept()
         self.active_connections[client_id] = websocket
+        self._connection_snapshot = tuple(self.active_connections.items())
         logger.info(f"Client {client_id} connected")
     
     def disconnect(self, client_id: str):
         """Remove WebSocket connection"""
         if client_id in self.active_connections:
             del self.active_connections[client_id]
+            self._connection_snapshot = tuple(self.active_connections.items())
             logger.info(f"Client {client_id} disconnected")
     
     async def send_message(self, client_id: str, message: Dict[str, Any]):
@@ -32,27 +47,66 @@ class WebSocketManager:
             try:
                 # Add timestamp to all messages
                 if isinstance(message, dict) and "timestamp" not in message:
-                    message["timestamp"] = datetime.now().isoformat()
+                    message["timestamp"] = now_iso()
                     
-                await self.active_connections[client_id].send_text(json.dumps(message))
+                await self.active_connections[client_id].send_text(orjson.dumps(message, default=_encode_default, option=_ORJSON_OPTIONS).decode())
                 logger.debug(f"Message sent to {client_id}: {message.get('type', 'unknown')}") 
             except Exception as e:
                 logger.error(f"Error sending message to {client_id}: {str(e)}")
                 self.disconnect(client_id)
     
+    async def send_event(self, client_id: str, message_type: str, event: Any):
+        """Send a dataclass event, serialized once with orjson
+        
+        The event body is encoded natively and spliced after the type and
+        timestamp keys, so no intermediate dict is built per update.
+        """
+        if client_id in self.active_connections:
+            try:
+                header = orjson.dumps({"type": message_type, "timestamp": now_iso()})
+                body = orjson.dumps(event, default=_encode_default, option=_ORJSON_OPTIONS)
+                payload = header[:-1] + b"," + body[1:] if len(body) > 2 else header
+                
+                await self.active_connections[client_id].send_text(payload.decode())
+                logger.debug(f"Event sent to {client_id}: {message_type}")
+            except Exception as e:
+                logger.error(f"Error sending event to {client_id}: {str(e)}")
+                self.disconnect(client_id)
+    
     async def send_error(self, client_id: str, error_message: str):
         """Send error message to client"""
         await self.send_message(client_id, {
             "type": "error",
             "message": error_message,
-            "timestamp": str(datetime.now())
+            "timestamp": now_iso()
         })
     
     async def broadcast(self, message: Dict[str, Any]):
         """Broadcast message to all connected clients"""
         logger.info(f"Broadcasting message of type: {message.get('type', 'unknown')} to {len(self.active_connections)} clients")
-        for client_id in list(self.active_connections.keys()):
-            await self.send_message(client_id, message)
+        if "timestamp" not in message:
+            message["timestamp"] = now_iso()
+            
+        # Serialize once and send to every client concurrently
+        payload = orjson.dumps(message, default=_encode_default, option=_ORJSON_OPTIONS).decode()
+        clients = self._connection_snapshot
+        results = await asyncio.gather(
+            *(websocket.send_text(payload) for _, websocket in clients),
+            return_exceptions=True
+        )
+        
+        # Drop the dead sockets in one pass, rebuilding the snapshot once
+        dropped = False
+        for (client_id, websocket), result in zip(clients, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error sending message to {client_id}: {str(result)}")
+                # Leave a connection that reconnected under the same id alone
+                if self.active_connections.get(client_id) is websocket:
+                    del self.active_connections[client_id]
+                    logger.info(f"Client {client_id} disconnected")
+                    dropped = True
+        if dropped:
+            self._connection_snapshot = tuple(self.active_connections.items())
             
     async def send_progress_update(self, client_id: str, message_type: str, progress: int, status: str, details: str = None):
         """Helper method to send progress updates"""
@@ -60,7 +114,7 @@ class WebSocketManager:
             "type": message_type,
             "progress": progress,
             "status": status,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }
         
         if details:
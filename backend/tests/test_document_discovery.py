@@ -0,0 +1,30 @@
+"""
+Tests for DocumentDiscoveryService file handling (run from backend/: python -m pytest tests)
+"""
+
+import base64
+import os
+
+import pytest
+
+import services.document_discovery as document_discovery
+from services.document_discovery import DocumentDiscoveryService
+
+
+@pytest.fixture
+def service():
+    # _write_base64_file needs no service state, so skip the directory/OCR setup in __init__
+    return DocumentDiscoveryService.__new__(DocumentDiscoveryService)
+
+
+@pytest.mark.parametrize("chunk_size", [4, 10, 1 << 16])
+def test_write_base64_file_accepts_wrapped_input(service, tmp_path, monkeypatch, chunk_size):
+    monkeypatch.setattr(document_discovery, "_BASE64_CHUNK_SIZE", chunk_size)
+    raw = os.urandom(1000)
+    wrapped = base64.encodebytes(raw).decode()
+    assert "\n" in wrapped
+    
+    target = tmp_path / "upload.bin"
+    service._write_base64_file(str(target), wrapped)
+    
+    assert target.read_bytes() == raw == base64.b64decode(wrapped)
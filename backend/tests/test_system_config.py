@@ -0,0 +1,58 @@
+"""
+Tests for SystemConfigService Groq key handling (run from backend/: python -m pytest tests)
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from services.system_config import SystemConfigService
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    # The service saves to ./data/config.json relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    return SystemConfigService()
+
+
+def test_resave_returned_key(service, tmp_path):
+    async def scenario():
+        await service.save_api_key({"name": "primary", "key": "gsk_1", "active": True})
+        key = (await service.get_api_keys())["keys"][0]
+        key["name"] = "renamed"
+        
+        result = await service.save_api_key(key)
+        await service.flush()
+        return result
+    
+    result = asyncio.run(scenario())
+    
+    saved = result["keys"]
+    assert len(saved) == 1
+    assert saved[0]["name"] == "renamed"
+    assert saved[0]["key"] == "gsk_1"
+    assert saved[0]["active"] is True
+    on_disk = json.loads((tmp_path / "data" / "config.json").read_text())
+    assert on_disk["llm_config"]["groq_keys"] == saved
+
+
+def test_caller_activated_key_can_be_saved_and_deleted(service):
+    async def scenario():
+        await service.save_api_key({"name": "first", "key": "gsk_1"})
+        await service.save_api_key({"name": "second", "key": "gsk_2"})
+        first, second = (await service.get_api_keys())["keys"]
+        # Flags set directly on the live dicts, so the service never tracked them
+        first["active"] = True
+        second["active"] = True
+        
+        await service.save_api_key(dict(first))
+        result = await service.delete_api_key(second["id"])
+        await service.flush()
+        return result
+    
+    result = asyncio.run(scenario())
+    
+    assert [key["name"] for key in result["keys"]] == ["first"]
+    assert result["keys"][0]["active"] is True